@@ -1,51 +1,81 @@
 import io
 import struct
+import binascii
+import itertools
+import mmap
 import hashlib
 from . import tonie_header_pb2
 
 
 OGG_MAGIC = b"OggS"
 PAGE_HEADER_FORMAT = "<BBQLLLB"
+PAGE_HEADER = struct.Struct(PAGE_HEADER_FORMAT)
+PAGE_CHECKSUM = struct.Struct("<L")
+TONIE_HEADER_SIZE = struct.Struct(">L")
 OPUS_HEADER_MAGIC = b"OpusHead"
 OPUS_HEADER_FORMAT = "<8sBBHL"
 OPUS_VERSION = 1
-CELT_FRAME_DURATIONS = [2.5, 5, 10, 20]
+# frame sizes of CELT configurations (16-31) in samples at 48 kHz
+# https://datatracker.ietf.org/doc/html/rfc7845#section-4
+CELT_FRAME_SAMPLES = (0,) * 16 + (120, 240, 480, 960) * 4
+# frame counts per framepacking, 0 = count stored in second byte
+FRAME_COUNTS = (1, 2, 2, 0)
 PAGE_SIZE = 0x1000
 
 
-crc_table = []
-for i in range(256):
-    k = i << 24
-    for _ in range(8):
-        k = (k << 1) ^ 0x04c11db7 if k & 0x80000000 else k << 1
-    crc_table.append(k & 0xffffffff)
+# the Ogg CRC is the non-reflected variant of the polynomial 0x04c11db7
+# used by binascii.crc32, so it can be computed on bit-reversed input bytes;
+# the resulting register is the bit-reversed Ogg checksum
+# binascii.crc32 uses zlib if available and its own C loop otherwise
 
+bit_reversed = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
 
-def crc32(bytestream):
-    crc = 0
-    for byte in bytestream:
-        lookup_index = ((crc >> 24) ^ byte) & 0xff
-        crc = ((crc & 0xffffff) << 8) ^ crc_table[lookup_index]
-    return crc
 
+def reverse_bits(value: int) -> int:
+    value_bytes = value.to_bytes(4, "little").translate(bit_reversed)
+    return int.from_bytes(value_bytes, "big")
 
-# OPH = Ogg Page Header
-OPH_VERSION = 0
-OPH_PAGE_TYPE = 1
-OPH_GRANULE_POS = 2
-OPH_SERIAL_NO = 3
-OPH_PAGE_NO = 4
-OPH_CHECKSUM = 5
-OPH_SEGMENT_COUNT = 6
 
+# crc32 can continue a running checksum: crc32(b, crc32(a)) == crc32(a + b)
 
-class OggPage:
+def crc32(bytestream: bytes | bytearray, crc: int = 0) -> int:
+    reflected_data = bytestream.translate(bit_reversed)
+    reflected_crc = reverse_bits(crc) ^ 0xffffffff
+    reflected_crc = binascii.crc32(reflected_data, reflected_crc) ^ 0xffffffff
+    return reverse_bits(reflected_crc)
+
+
+# every page starts with the magic, so its CRC state is computed only once
+MAGIC_CRC = crc32(OGG_MAGIC)
 
-    def __init__(self, info: list):
 
-        self.info = info
+class OggPage:
+
+    # the underscore slots cache values derived from the header fields and
+    # segments, and are not keyed on them: after the page is first used,
+    # change segments only through set_opus_packets, and follow any direct
+    # change of a header field with update_checksum, both of which reset
+    # the caches
+    __slots__ = ("version", "page_type", "granule_position", "serial_no",
+                 "page_no", "checksum", "segments",
+                 "_serialized", "_sample_count")
+
+    def __init__(self, version: int, page_type: int, granule_position: int,
+                 serial_no: int, page_no: int, checksum: int = 0):
+
+        # the segment count is not stored, but taken from the segments
+        self.version = version
+        self.page_type = page_type
+        self.granule_position = granule_position
+        self.serial_no = serial_no
+        self.page_no = page_no
+        self.checksum = checksum
         self.segments: list[bytes] = []
 
+        # derived from header and segments, reset by set_opus_packets
+        self._serialized: bytes | None = None
+        self._sample_count: int | None = None
+
     def get_opus_packets(self) -> list[list[bytes]]:
 
         packets = [[]]
@@ -59,6 +89,8 @@ class OggPage:
 
     def set_opus_packets(self, packets: list[list[bytes]]) -> int:
 
+        self._serialized = None
+        self._sample_count = None
         self.segments = [s for p in packets for s in p]
         if len(packets[-1][-1]) == 255:
             self.segments.append(b"")
@@ -66,70 +98,87 @@ class OggPage:
 
     def get_sample_count(self) -> int:
 
+        if self._sample_count is not None:
+            return self._sample_count
+
         # https://datatracker.ietf.org/doc/html/rfc7845
         
-        duration_ms = 0
+        sample_count = 0
         prev_length = 0
         for segment in self.segments:
             if prev_length < 255:  # continued segment
 
                 # https://datatracker.ietf.org/doc/html/rfc6716#section-3.1
                 config_value = segment[0] >> 3
-                framepacking = segment[0] & 3
-
                 assert config_value > 15, config_value  # CELT
-                assert framepacking < 4, framepacking
-                frame_duration = CELT_FRAME_DURATIONS[config_value % 4]
-                
-                if framepacking == 0:
-                    frame_count = 1
-                elif framepacking < 3:
-                    frame_count = 2
-                else:
-                    frame_count = segment[1] & 63
-
-                duration_ms += frame_duration * frame_count
+
+                frame_count = FRAME_COUNTS[segment[0] & 3] or segment[1] & 63
+                sample_count += CELT_FRAME_SAMPLES[config_value] * frame_count
             prev_length = len(segment)
 
-        # https://datatracker.ietf.org/doc/html/rfc7845#section-4
-        return duration_ms * 48 # KHz
+        self._sample_count = sample_count
+        return sample_count
 
-    def serialize_with(self, is_last: bool, granule_position: int, page_num: int):
+    def serialize_with(self, is_last: bool, granule_position: int, page_num: int) -> bytes:
 
-        adj_info = list(self.info)
-        adj_info[OPH_PAGE_TYPE] = 4 if is_last else 0
-        adj_info[OPH_GRANULE_POS] = granule_position
-        adj_info[OPH_PAGE_NO] = page_num
-        page = OggPage(adj_info)
-        page.segments = self.segments
-        page.update_checksum()
-        return page.serialize()
+        page_data = bytearray(self.get_size())
+        self.serialize_with_into(page_data, 0, is_last, granule_position, page_num)
+        return bytes(page_data)
 
-    def update_checksum(self):
+    def serialize_with_into(self, buffer: bytearray, offset: int, is_last: bool,
+                            granule_position: int, page_num: int) -> int:
 
-        self.info[OPH_SEGMENT_COUNT] = len(self.segments)
-        self.info[OPH_CHECKSUM] = 0
-        checksum_data = self.serialize()
-        self.info[OPH_CHECKSUM] = crc32(checksum_data)
+        page_type = 4 if is_last else 0
+        end, _ = self.pack_into(buffer, offset, page_type,
+                                granule_position, page_num)
+        return end
 
-    def serialize_header(self) -> bytes:
+    def update_checksum(self):
 
-        return struct.pack(PAGE_HEADER_FORMAT, *self.info)
+        # checksum the header and body parts in turn instead of
+        # assembling a temporary copy of the page
+        self.checksum = 0
+        header_data = self.serialize_header() + bytes(map(len, self.segments))
+        checksum = crc32(header_data, MAGIC_CRC)
+        self.checksum = crc32(b"".join(self.segments), checksum)
+        self._serialized = None
+
+    def pack_into(self, buffer: bytearray, offset: int, page_type: int,
+                  granule_position: int, page_no: int) -> tuple[int, int]:
+
+        # serialize with a zero checksum, then patch in the CRC
+        segment_count = len(self.segments)
+        body_start = offset + 27 + segment_count
+        body = b"".join(self.segments)
+        end = body_start + len(body)
+        buffer[offset:offset + 4] = OGG_MAGIC
+        PAGE_HEADER.pack_into(buffer, offset + 4, self.version, page_type,
+                              granule_position, self.serial_no, page_no,
+                              0, segment_count)
+        buffer[offset + 27:body_start] = bytes(map(len, self.segments))
+        buffer[body_start:end] = body
+        checksum = crc32(buffer[offset + 4:body_start], MAGIC_CRC)
+        checksum = crc32(body, checksum)
+        PAGE_CHECKSUM.pack_into(buffer, offset + 22, checksum)
+        return end, checksum
 
-    def serialize_body(self) -> bytes:
+    def serialize_header(self) -> bytes:
 
-        body = bytes(len(s) for s in self.segments)
-        for segment in self.segments:
-            body += segment
-        return body
+        return PAGE_HEADER.pack(self.version, self.page_type,
+                                self.granule_position, self.serial_no,
+                                self.page_no, self.checksum, len(self.segments))
 
-    def serialize(self):
+    def serialize(self) -> bytes:
 
-        return OGG_MAGIC + self.serialize_header() + self.serialize_body()
+        if self._serialized is None:
+            segment_table = bytes(map(len, self.segments))
+            self._serialized = b"".join([OGG_MAGIC, self.serialize_header(),
+                                         segment_table, *self.segments])
+        return self._serialized
 
     def get_size(self) -> int:
 
-        return 27 + len(self.segments) + sum(len(s) for s in self.segments)
+        return 27 + len(self.segments) + sum(map(len, self.segments))
 
 
 class OpusPacket:
@@ -138,7 +187,7 @@ class OpusPacket:
 
     def __init__(self, segments: list[bytes]):
 
-        self.data = [b for s in segments for b in s]
+        self.data = bytearray(b"".join(segments))
 
     def get_packing(self) -> int:
 
@@ -186,10 +235,9 @@ class OpusPacket:
             added_pads = (pad_len // 255) + 1
             zero_count = pad_len - added_segs - added_pads
 
-        pad_lengths = [255] * (zero_count // 255) + [zero_count % 255]
-        padding = [0] * zero_count
-
-        self.data = self.data[:2] + pad_lengths + self.data[2:] + padding
+        pad_lengths = b"\xff" * (zero_count // 255) + bytes([zero_count % 255])
+        self.data[2:2] = pad_lengths
+        self.data += b"\0" * zero_count
 
     def get_segments(self) -> list[bytes]:
 
@@ -214,13 +262,15 @@ class TonieAudio:
 
         # https://datatracker.ietf.org/doc/html/rfc7845#section-5.1
         first_segment = self.pages[0].segments[0]
-        opus_head = struct.unpack(OPUS_HEADER_FORMAT, first_segment[:16])
+        opus_head = struct.unpack_from(OPUS_HEADER_FORMAT, first_segment)
         assert opus_head[0] == OPUS_HEADER_MAGIC
         assert opus_head[1] == OPUS_VERSION
         self.channel_count = opus_head[2]
         self.pre_skip = opus_head[3]
         self.input_sample_rate = opus_head[4]
 
+        self._prefix_data: bytes | None = None
+
     def get_chapter_count(self) -> int: 
         
         return len(self.header.chapter_start_pages)
@@ -235,6 +285,15 @@ class TonieAudio:
             end_num = len(self.pages)
         return list(range(start_num, end_num))
 
+    def get_prefix_data(self) -> bytes:
+
+        # third page already contains first frames of first chapter
+        # however, it is required for correct alignment, and thus written at start
+        if self._prefix_data is None:
+            prefix_pages = self.pages[:3]
+            self._prefix_data = b"".join(p.serialize() for p in prefix_pages)
+        return self._prefix_data
+
 
 def parse_tonie(in_file: io.BufferedReader) -> TonieAudio:
 
@@ -255,33 +314,59 @@ def parse_tonie(in_file: io.BufferedReader) -> TonieAudio:
 
 def parse_tonie_header(in_file: io.BufferedReader) -> TonieHeader:
 
-    header_size = struct.unpack(">L", in_file.read(4))[0]
+    header_size, = TONIE_HEADER_SIZE.unpack(in_file.read(4))
     header_data = in_file.read(header_size)
     return TonieHeader(header_data)
 
 
 def parse_ogg(in_file: io.BufferedReader) -> list[OggPage]:
 
+    # map the remaining stream if possible, otherwise read it at once;
+    # segments are copied out, so the mapping is not needed afterwards.
+    # only plain files are mapped: wrappers like gzip.GzipFile report the
+    # descriptor of the underlying file, which tell() does not index
+    if not isinstance(getattr(in_file, "raw", in_file), io.FileIO):
+        return parse_ogg_data(in_file.read(), 0)
+
+    try:
+        stream_data = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # no file descriptor or empty file
+        return parse_ogg_data(in_file.read(), 0)
+
+    with stream_data:
+        pages = parse_ogg_data(stream_data, in_file.tell())
+    in_file.seek(0, io.SEEK_END)  # consumed, as with read()
+    return pages
+
+
+def parse_ogg_data(data: bytes | mmap.mmap, offset: int) -> list[OggPage]:
+
     # https://datatracker.ietf.org/doc/html/rfc3533#section-6
 
+    data_length = len(data)
+
+    # bound once, as these are used for every page
+    unpack_header = PAGE_HEADER.unpack_from
+    accumulate = itertools.accumulate
+
     pages: list[OggPage] = []
 
-    while True:
+    while offset < data_length:
 
-        magic = in_file.read(4)
-        if len(magic) == 0:
-            break
-        assert magic == OGG_MAGIC
+        assert data[offset:offset + 4] == OGG_MAGIC
 
-        header = in_file.read(23)
-        info = struct.unpack(PAGE_HEADER_FORMAT, header)
-        page = OggPage(list(info))
-        assert page.info[OPH_PAGE_NO] == len(pages)
-        segment_count = page.info[OPH_SEGMENT_COUNT]
-        segment_lengths = in_file.read(segment_count)
-        for length in segment_lengths:
-            segment = in_file.read(length)
-            page.segments.append(segment)
+        (version, page_type, granule_position, serial_no, page_no, checksum,
+         segment_count) = unpack_header(data, offset + 4)
+        assert page_no == len(pages)
+        page = OggPage(version, page_type, granule_position, serial_no,
+                       page_no, checksum)
+        offset += 27
+        segment_lengths = data[offset:offset + segment_count]
+        offset += segment_count
+        bounds = list(accumulate(segment_lengths, initial=offset))
+        page.segments = [data[start:end]
+                         for start, end in zip(bounds, bounds[1:])]
+        offset = bounds[-1]
 
         pages.append(page)
 
@@ -297,7 +382,12 @@ def append_chapter(tonie_audio: TonieAudio, in_file: io.BufferedReader) -> int:
     src_pages = parse_ogg(in_file)
 
     last_page = tonie_audio.pages[-1]
-    granule_position = last_page.info[OPH_GRANULE_POS]
+    granule_position = last_page.granule_position
+    version = last_page.version
+    page_type = last_page.page_type
+    serial_no = last_page.serial_no
+    append_page = tonie_audio.pages.append
+
     next_page_packets: list[list[bytes]] = []
     next_page_size = 27
     next_page_seg_count = 0
@@ -305,31 +395,31 @@ def append_chapter(tonie_audio: TonieAudio, in_file: io.BufferedReader) -> int:
     for src_page in src_pages[2:]:
         for packet in src_page.get_opus_packets():
 
-            added_size = len(packet) + sum(len(s) for s in packet)
+            segment_count = len(packet)
+            added_size = segment_count + sum(map(len, packet))
             # assert that the packet itself isn't already too big for a page
             assert 27 + added_size < PAGE_SIZE, added_size
 
             # repacking may add bytes, but padding cannot shrink,
             # so we need to make sure that the packet fits even if
             # it ends up being the last one and will get repacked
-            repacked = repack_packet(packet)
-            repacked_size = len(repacked) + sum(len(s) for s in repacked)
+            repacked_size = get_repacked_size(packet)
 
-            if next_page_size + repacked_size >= PAGE_SIZE or next_page_seg_count + len(packet) > 255:
-                dst_page = OggPage(last_page.info)
-                dst_page.info[OPH_PAGE_NO] = next_page_num
+            if next_page_size + repacked_size >= PAGE_SIZE or next_page_seg_count + segment_count > 255:
+                dst_page = OggPage(version, page_type, 0, serial_no,
+                                   next_page_num)
                 pad_page(dst_page, next_page_packets)
                 granule_position += dst_page.get_sample_count()
-                dst_page.info[OPH_GRANULE_POS] = granule_position
+                dst_page.granule_position = granule_position
                 dst_page.update_checksum()
-                tonie_audio.pages.append(dst_page)
+                append_page(dst_page)
                 next_page_num += 1
                 next_page_packets = []
                 next_page_size = 27
                 next_page_seg_count = 0
 
             next_page_packets.append(packet)
-            next_page_seg_count += len(packet)
+            next_page_seg_count += segment_count
             next_page_size += added_size
 
     return new_chapter_num
@@ -342,7 +432,8 @@ def pad_page(page: OggPage, packets: list[list[bytes]]) -> OggPage:
         return page
 
     padded = False
-    debug_info = "pre %i -1=%s\n" % (missing_bytes, [len(s) for s in packets[-1]])
+    # (step, missing bytes, packet index, packet), formatted only on failure
+    debug_steps = [("pre", missing_bytes, -1, packets[-1])]
 
     # padding of last packet may undershoot due to segment boundary effects.
     # padding earlier packets to pad_len = None (zero) adds a single byte.
@@ -353,7 +444,7 @@ def pad_page(page: OggPage, packets: list[list[bytes]]) -> OggPage:
         missing_bytes = page.set_opus_packets(packets)
         if missing_bytes == 0:
             return page
-        debug_info += "rep %i %i=%s\n" % (missing_bytes, -i, [len(s) for s in packets[-i]])
+        debug_steps.append(("rep", missing_bytes, -i, packets[-i]))
         if padded:
             pad_len = None # empty padding, adds one byte
         else:
@@ -363,19 +454,22 @@ def pad_page(page: OggPage, packets: list[list[bytes]]) -> OggPage:
         missing_bytes = page.set_opus_packets(packets)
         if missing_bytes == 0:
             return page
-        debug_info += "pad %i %i=%s\n" % (missing_bytes, -i, [len(s) for s in packets[-i]])
+        debug_steps.append(("pad", missing_bytes, -i, packets[-i]))
 
+    debug_info = ""
+    for step, step_missing_bytes, index, packet in debug_steps:
+        segment_lengths = [len(s) for s in packet]
+        debug_info += "%s %i %i=%s\n" % (step, step_missing_bytes, index, segment_lengths)
     print(debug_info)
 
-    page_num = page.info[OPH_PAGE_NO]
-    raise AssertionError(page_num)
+    raise AssertionError(page.page_no)
 
 
 # https://datatracker.ietf.org/doc/html/rfc6716#section-3.2.5
 
 def repack_packet(packet: list[bytes]) -> list[bytes]:
 
-    data = [b for s in packet for b in s]
+    data = bytearray(b"".join(packet))
 
     framepacking = data[0] & 3
     if framepacking != 3:
@@ -395,9 +489,25 @@ def repack_packet(packet: list[bytes]) -> list[bytes]:
     return [bytes(data[i:i + 255]) for i in range(0, len(data), 255)]
 
 
+def get_repacked_size(packet: list[bytes]) -> int:
+
+    # size of repack_packet(packet) including its segment table,
+    # computed without actually repacking
+
+    data_len = sum(map(len, packet))
+    framepacking = packet[0][0] & 3
+    if framepacking == 2:
+        # same validation as repack_packet
+        size1 = packet[0][2]
+        assert size1 < 255, size1
+    if framepacking != 3:
+        data_len += 1  # frame count byte
+    return data_len + (data_len + 254) // 255
+
+
 def pad_packet(packet: list[bytes], pad_len: int | None) -> list[bytes]:
 
-    data = [b for s in packet for b in s]
+    data = bytearray(b"".join(packet))
 
     framepacking = data[0] & 3
     assert framepacking == 3
@@ -418,10 +528,9 @@ def pad_packet(packet: list[bytes], pad_len: int | None) -> list[bytes]:
             added_pads = (pad_len // 255) + 1
             zero_count = pad_len - added_segs - added_pads
 
-        pad_lengths = [255] * (zero_count // 255) + [zero_count % 255]
-        padding = [0] * zero_count
-
-        data = data[:2] + pad_lengths + data[2:] + padding
+        pad_lengths = b"\xff" * (zero_count // 255) + bytes([zero_count % 255])
+        data[2:2] = pad_lengths
+        data += b"\0" * zero_count
 
     return [bytes(data[i:i + 255]) for i in range(0, len(data), 255)]
 
@@ -435,55 +544,66 @@ def compose(tonie_audio: TonieAudio,
         chapter_count = tonie_audio.get_chapter_count()
         chapter_nums = list(range(chapter_count))
 
-    if add_header:
-        out_file.write(bytearray(PAGE_SIZE))  # placeholder
+    prefix_data = tonie_audio.get_prefix_data()
+
+    chapter_page_nums = []
+    for chapter_num in chapter_nums:
+        src_page_nums = tonie_audio.get_chapter_page_nums(chapter_num)
+        chapter_page_nums.append([n for n in src_page_nums if n >= 3])
 
-    sha1 = hashlib.sha1()
+    # the output size is known upfront, so all pages are serialized
+    # into a single buffer that is hashed and written at once
 
-    # third page already contains first frames of first chapter
-    # however, it is required for correct alignment, and thus written at start
+    data_length = len(prefix_data)
+    for src_page_nums in chapter_page_nums:
+        data_length += sum(tonie_audio.pages[n].get_size() for n in src_page_nums)
 
-    for page in tonie_audio.pages[:3]:
-        page_data = page.serialize()
-        out_file.write(page_data)
-        sha1.update(page_data)
+    data_start = PAGE_SIZE if add_header else 0  # header placeholder
+    out_data = bytearray(data_start + data_length)
+    out_data[data_start:data_start + len(prefix_data)] = prefix_data
+    offset = data_start + len(prefix_data)
 
     chapter_pages = []
-    granule_position = tonie_audio.pages[2].info[OPH_GRANULE_POS]
+    granule_position = tonie_audio.pages[2].granule_position
     dst_page_num = 3
 
-    for chapter_num in chapter_nums:
+    for chapter_num, src_page_nums in zip(chapter_nums, chapter_page_nums):
         chapter_page_num = 0 if len(chapter_pages) == 0 else dst_page_num
         chapter_pages.append(chapter_page_num)
-        src_page_nums = tonie_audio.get_chapter_page_nums(chapter_num)
         last_chapter = chapter_num == chapter_nums[-1]
         for src_page_num in src_page_nums:
-            if src_page_num < 3:
-                continue
             page = tonie_audio.pages[src_page_num]
             granule_position += page.get_sample_count()
             last_page = last_chapter and src_page_num == src_page_nums[-1]
-            page_data = page.serialize_with(
-                last_page, granule_position, dst_page_num)
-            out_file.write(page_data)
-            sha1.update(page_data)
+            offset = page.serialize_with_into(
+                out_data, offset, last_page, granule_position, dst_page_num)
             dst_page_num += 1
 
     if add_header:
         tonie_header = tonie_header_pb2.TonieHeader()
+        # the hash only identifies the audio data, it is not a security feature
+        sha1 = hashlib.sha1(memoryview(out_data)[data_start:],
+                            usedforsecurity=False)
         tonie_header.dataHash = sha1.digest()
-        tonie_header.dataLength = out_file.seek(0, 1) - PAGE_SIZE
+        tonie_header.dataLength = data_length
         tonie_header.timestamp = tonie_audio.header.timestamp
         tonie_header.chapterPages.extend(chapter_pages)
-        tonie_header.padding = bytes(0x100)
 
-        tonie_header_data = tonie_header.SerializeToString()
-        pad = 0xFFC - len(tonie_header_data) + 0x100
+        # the padding field adds a tag byte and a varint length,
+        # which takes one byte below 128 and two bytes up to 0x3FFF
+        pad_field_size = 0xFFC - tonie_header.ByteSize() - 1
+        pad = pad_field_size - (1 if pad_field_size <= 128 else 2)
+        # empty padding is not serialized (proto3), and 129 bytes fall
+        # between the one and two byte length encodings
+        if pad < 1 or pad_field_size == 129:
+            raise ValueError("chapter list leaves an impossible header "
+                             f"padding size of {pad_field_size} bytes")
         tonie_header.padding = bytes(pad)
         tonie_header_data = tonie_header.SerializeToString()
 
-        out_file.seek(0)
-        out_file.write(struct.pack(">L", len(tonie_header_data)))
-        out_file.write(tonie_header_data)
+        TONIE_HEADER_SIZE.pack_into(out_data, 0, len(tonie_header_data))
+        out_data[4:4 + len(tonie_header_data)] = tonie_header_data
+
+    out_file.write(out_data)
 
     return chapter_pages